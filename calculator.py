@@ -44,16 +44,29 @@ To test in the AWS Management Console use:
 import json
 import uuid
 import logging
-import math
-
-from botocore.vendored import requests
-from netaddr import IPNetwork
+import socket
+import struct
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
+from urllib.error import HTTPError
+from urllib.parse import urlsplit
 
 SUCCESS = "SUCCESS"
 FAILED = "FAILED"
-PHYSICAL_RESOURCE_ID = f"SubnetCidrCalculator-{uuid.uuid1()}"
+# number of extra prefix bits needed to split a layer across 0..4 zones
+_AZ_MOD = (0, 0, 1, 2, 2)
+# inclusive (lower, upper, message index) limits checked by check_parameters
+_LIMITS = ((16, 28, 0), (1, 4, 1), (1, 4, 2))
+_ERRS = (
+    'Illegal prefix number used.  Please use a number between 16 and 28 inclusive',
+    'Illegal number of network layers used.  Please use a list containing between 1 and 4 layers inclusive',
+    'Illegal number of availability zones used.  Please use a number between 1 and 4 inclusive',
+    )
+_PHYSICAL_RESOURCE_ID = None
+# kept-alive connections to the response endpoints, keyed by (scheme, netloc)
+_CONNECTIONS = {}
 
 logger = logging.getLogger()
+logger.setLevel(logging.INFO)
 
 def handler(event, context):
     '''
@@ -86,9 +99,9 @@ def handler(event, context):
     availability_zones = int(properties["ZonesRequired"])
     
     # get the network address for a given network_cidr
-    nw = IPNetwork(network_cidr)
+    ip_str, _, prefix = network_cidr.partition('/')
     # check the minimum and maximum prefixes allowed by AWS VPC
-    cidr_prefix = nw.prefixlen
+    cidr_prefix = int(prefix or 32)
 
     # check the parameters
     params = {
@@ -107,18 +120,18 @@ def handler(event, context):
 
     # calculate the VPC Network as the given Network IP may not
     # be the Network IP address as calculated using the hostmask
-    network_ip = nw.network
-    network = IPNetwork(network_ip)
-    network.prefixlen = cidr_prefix
-    az_modifier = math.ceil(math.log(availability_zones)/math.log(2))
+    mask = (0xFFFFFFFF << (32 - cidr_prefix)) & 0xFFFFFFFF
+    base = struct.unpack('>I', socket.inet_aton(ip_str))[0] & mask
+    az_modifier = _AZ_MOD[availability_zones]
     
     try:
-        for layer_index in range(1,network_layers+1):
-            tmp_prefix = cidr_prefix + layer_index
-            network_by_layer = list(network.subnet(tmp_prefix))
-            network = network_by_layer[1]
-            network_by_az = list(network_by_layer[0].subnet(tmp_prefix+az_modifier))
-            response_data[f"layer{layer_index}"] = str(network_by_layer[0]) + "," + ",".join([str(nw) for nw in network_by_az])
+        cidrs_by_layer = compute_cidrs(base, cidr_prefix, network_layers, az_modifier)
+        # each layer holds the layer block plus one entry per zone
+        buf = [""] * (1 + (1 << az_modifier))
+        for layer_index, cidrs in enumerate(cidrs_by_layer, 1):
+            for k, (nw_base, nw_prefix) in enumerate(cidrs):
+                buf[k] = format_cidr(nw_base, nw_prefix)
+            response_data[f"layer{layer_index}"] = ",".join(buf)
     except Exception as ex:
         logger.error(ex)
         return send_response(
@@ -126,16 +139,82 @@ def handler(event, context):
             reason=f"{ex.__class__.__name__}: {ex}"
             )
 
-    print(response_data)
+    logger.info("%s", response_data)
     return send_response(event, context, SUCCESS, response_data=response_data)
 
+def compute_cidrs(base, prefix, n_layers, az_mod):
+    '''
+    Calculates the (base, prefix) pairs for every layer.  Each layer
+    takes the first half of the space left over by the previous one
+    and is then split into 2**az_mod zone subnets.
+
+    Parameters
+    ----------
+    base: int
+        Network address of the VPC, as a 32 bit integer.
+    prefix: int
+        Prefix length of the VPC.
+    n_layers: int
+        Number of network layers.
+    az_mod: int
+        Extra prefix bits needed for the zone subnets.
+
+    Returns
+    -------
+    A list, one entry per layer, of (base, prefix) pairs where the
+    first pair is the layer block followed by its zone subnets.
+    '''
+    az_count = 1 << az_mod
+    cidrs_by_layer = []
+    for layer_index in range(1, n_layers+1):
+        layer_prefix = prefix + layer_index
+        layer = [(base, layer_prefix)]
+        layer.extend(split_cidr(base, layer_prefix, layer_prefix+az_mod, az_count))
+        cidrs_by_layer.append(layer)
+        # the remaining space is the second half of the current block
+        base += 1 << (32 - layer_prefix)
+    return cidrs_by_layer
+
+def split_cidr(base, prefix, new_prefix, count):
+    '''
+    Splits the network (base, prefix) into the first count subnets
+    of size new_prefix.
+
+    Parameters
+    ----------
+    base: int
+        Network address of the block being split, as a 32 bit integer.
+    prefix: int
+        Prefix length of the block being split.
+    new_prefix: int
+        Prefix length of the resulting subnets.
+    count: int
+        Number of subnets to return.
+    '''
+    step = 1 << (32 - new_prefix)
+    return [(base + k*step, new_prefix) for k in range(count)]
+
+def format_cidr(base, prefix):
+    '''
+    Renders a (base, prefix) pair in the usual a.b.c.d/p notation.
+    '''
+    return f"{socket.inet_ntoa(struct.pack('>I', base))}/{prefix}"
+
 def check_parameters(**params):
-    if (params['cidr_prefix'] < 16 or params['cidr_prefix'] > 28):
-        raise ValueError('Illegal prefix number used.  Please use a number between 16 and 28 inclusive')
-    if (params['layers'] < 1 or params['layers'] > 4):
-        raise ValueError('Illegal number of network layers used.  Please use a list containing between 1 and 4 layers inclusive')
-    if (params['availability_zones'] < 1 or params['availability_zones'] > 4):
-        raise ValueError('Illegal number of availability zones used.  Please use a number between 1 and 4 inclusive')
+    vals = (params['cidr_prefix'], params['layers'], params['availability_zones'])
+    for v, (lo, hi, idx) in zip(vals, _LIMITS):
+        if v < lo or v > hi:
+            raise ValueError(_ERRS[idx])
+
+def _physical_id():
+    '''
+    Returns the physical resource id for this container, creating it
+    on first use rather than at import time.
+    '''
+    global _PHYSICAL_RESOURCE_ID
+    if _PHYSICAL_RESOURCE_ID is None:
+        _PHYSICAL_RESOURCE_ID = f"SubnetCidrCalculator-{uuid.uuid4().hex}"
+    return _PHYSICAL_RESOURCE_ID
 
 def send_response(event, context, response_status, response_data=None, reason=None):
     """This function will wrap a response into a json object and send back to 
@@ -166,24 +245,57 @@ def send_response(event, context, response_status, response_data=None, reason=No
     response_body = json.dumps(
         {
             "Status": response_status,
-            "Reason": str(reason) + f".. {default_reason}" if reason else default_reason,
-            "PhysicalResourceId": PHYSICAL_RESOURCE_ID,
+            "Reason": f"{reason}.. {default_reason}" if reason else default_reason,
+            "PhysicalResourceId": _physical_id(),
             "StackId": event["StackId"],
             "RequestId": event["RequestId"],
             "LogicalResourceId": event["LogicalResourceId"],
             "Data": response_data,
-        }
+        },
+        separators=(",", ":")
     )
 
-    logger.info(f"ResponseURL: {event['ResponseURL']}", )
-    logger.info(f"ResponseBody: {response_body}")
+    logger.info("ResponseURL: %s", event['ResponseURL'])
+    logger.info("ResponseBody: %s", response_body)
 
-    headers = {"Content-Type": "", "Content-Length": str(len(response_body))}
+    # Content-Length must be the byte length of the encoded body
+    body_bytes = response_body.encode('utf-8')
+    headers = {"Content-Type": "", "Content-Length": str(len(body_bytes))}
 
-    response = requests.put(event["ResponseURL"], data=response_body, headers=headers)
+    response, content = _put(event["ResponseURL"], body_bytes, headers)
     try:
-        response.raise_for_status()
-        logger.info(f"Status code: {response.reason}")
-    except requests.HTTPError:
-        logger.exception(f"Failed to send CFN response. {response.text}")
+        if response.status >= 400:
+            raise HTTPError(
+                event["ResponseURL"], response.status, response.reason,
+                response.headers, None
+                )
+        logger.info("Status code: %s", response.reason)
+    except HTTPError:
+        logger.exception("Failed to send CFN response. %s", content.decode('utf-8', 'replace'))
         raise
+
+def _put(url, body, headers):
+    '''
+    PUTs the body to the given url and returns the response together
+    with its content.  Connections are kept alive between invocations
+    of a warm container; a cached connection that has since been closed
+    by the server is retried once on a fresh connection.
+    '''
+    parts = urlsplit(url)
+    target = f"{parts.path or '/'}?{parts.query}" if parts.query else parts.path or '/'
+    key = (parts.scheme, parts.netloc)
+    while True:
+        reused = key in _CONNECTIONS
+        if not reused:
+            conn_class = HTTPSConnection if parts.scheme == 'https' else HTTPConnection
+            _CONNECTIONS[key] = conn_class(parts.netloc, timeout=10)
+        conn = _CONNECTIONS[key]
+        try:
+            conn.request('PUT', target, body=body, headers=headers)
+            response = conn.getresponse()
+            return response, response.read()
+        except (HTTPException, OSError):
+            conn.close()
+            del _CONNECTIONS[key]
+            if not reused:
+                raise
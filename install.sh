@@ -33,9 +33,6 @@ home=$(pwd)
 
 cp calculator.py ${build_dir}/calculator.py
 
-# Lambda function uses netaddr library
-pip install netaddr -t ${build_dir}
-
 # Compress and register the function with Regional Lambda Service
 cd ${build_dir}
 zip -r ${home}/cidr_calc.zip .